@@ -6,12 +6,15 @@ This example shows the simplest way to use the RNA-seq FactorNet package
 for expression analysis and interpretation.
 """
 
+from pathlib import Path
+
+from rna_seq_factornet import ExpressionPipeline, quick_analysis, load_example_data
+
+
 # =============================================================================
 # EXAMPLE 1: Simple 3-line analysis
 # =============================================================================
 
-from rna_seq_factornet import ExpressionPipeline
-
 # Create pipeline and analyze
 pipeline = ExpressionPipeline()
 pipeline.load_data('your_expression_data.csv')
@@ -26,8 +29,6 @@ pipeline.visualize(results)
 # EXAMPLE 2: Quick one-liner analysis
 # =============================================================================
 
-from rna_seq_factornet import quick_analysis
-
 # Everything in one function call
 pipeline, results = quick_analysis(
     'your_expression_data.csv', 
@@ -40,8 +41,6 @@ pipeline, results = quick_analysis(
 # EXAMPLE 3: Working with example data
 # =============================================================================
 
-from rna_seq_factornet import load_example_data, ExpressionPipeline
-
 # Load synthetic example data
 example_file = load_example_data()
 print(f"Example data created: {example_file}")
@@ -63,8 +62,6 @@ comparison = pipeline.compare_methods(['bpnet', 'saliency'], n_genes=3)
 # EXAMPLE 4: Custom parameters
 # =============================================================================
 
-from rna_seq_factornet import ExpressionPipeline
-
 pipeline = ExpressionPipeline()
 
 # Load data with custom preprocessing
@@ -94,14 +91,13 @@ results = pipeline.interpret(
 
 # Visualize and save plots
 pipeline.visualize(results, save_dir='./my_plots')
+pipeline.join()                       # Wait for the plots to be written
 
 
 # =============================================================================
 # EXAMPLE 5: Different data formats
 # =============================================================================
 
-from rna_seq_factornet import ExpressionPipeline
-
 pipeline = ExpressionPipeline()
 
 # CSV file
@@ -125,8 +121,6 @@ pipeline.load_data(
 # EXAMPLE 6: Save and load pipeline
 # =============================================================================
 
-from rna_seq_factornet import ExpressionPipeline
-
 # Train and save
 pipeline = ExpressionPipeline()
 pipeline.load_data('expression_data.csv')
@@ -145,9 +139,6 @@ results = new_pipeline.interpret('bpnet', n_genes=5)
 # EXAMPLE 7: Error handling
 # =============================================================================
 
-from rna_seq_factornet import ExpressionPipeline
-from pathlib import Path
-
 pipeline = ExpressionPipeline()
 
 # Check if file exists
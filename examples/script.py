@@ -1,10 +1,8 @@
 # Create a modular package structure for RNA-seq FactorNet
 import os
+import sys
 from pathlib import Path
 
-print("🏗️ CREATING MODULAR RNA-SEQ FACTORNET PACKAGE")
-print("=" * 60)
-
 # Create the package structure
 package_structure = {
     'rna_seq_factornet/': {
@@ -56,22 +54,38 @@ package_structure = {
     }
 }
 
-def create_directory_structure(structure, base_path='.'):
-    """Create directory structure recursively"""
+def create_directory_structure(structure, base_path='.', created=None):
+    """
+    Create directory structure recursively
+    
+    Returns:
+        List of progress lines for every created directory and file
+    """
+    if created is None:
+        created = []
+    
     for name, content in structure.items():
         path = Path(base_path) / name
         
         if isinstance(content, dict):
             # It's a directory
             path.mkdir(parents=True, exist_ok=True)
-            print(f"📁 Created directory: {path}")
-            create_directory_structure(content, path)
+            created.append(f"📁 Created directory: {path}")
+            create_directory_structure(content, path, created)
         else:
             # It's a file
             if not path.exists():
                 path.touch()
-                print(f"📄 Created file: {path}")
+                created.append(f"📄 Created file: {path}")
+    
+    return created
 
-# Create the structure
-create_directory_structure(package_structure)
-print("\n✅ Package structure created!")
\ No newline at end of file
+if __name__ == "__main__":
+    # Create the structure and report it in a single write
+    created = create_directory_structure(package_structure)
+    sys.stdout.write("\n".join([
+        "🏗️ CREATING MODULAR RNA-SEQ FACTORNET PACKAGE",
+        "=" * 60,
+        *created,
+        "\n✅ Package structure created!",
+    ]) + "\n")
@@ -1,4 +1,6 @@
 # Create GitHub repository support files
+import sys
+
 github_files = {
     ".gitignore": '''# Byte-compiled / optimized / DLL files
 __pycache__/
@@ -280,10 +282,12 @@ exclude_lines = [
 '''
 }
 
-# Create the files
+# Create the files and report them in a single write
+created = []
 for filename, content in github_files.items():
     with open(filename, 'w') as f:
         f.write(content)
-    print(f"✅ Created: {filename}")
+    created.append(f"✅ Created: {filename}")
 
-print("\n🎉 All GitHub repository files created!")
\ No newline at end of file
+created.append("\n🎉 All GitHub repository files created!")
+sys.stdout.write("\n".join(created) + "\n")
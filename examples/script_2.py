@@ -1,18 +1,6 @@
 # Create comprehensive GitHub repository structure summary
-print("🎯 COMPLETE MODULAR RNA-SEQ FACTORNET PACKAGE")
-print("=" * 70)
+import sys
 
-print("\n📦 1. SIMPLE IMPORT STRUCTURE:")
-print("```python")
-print("# Simple 3-line usage")
-print("from rna_seq_factornet import ExpressionPipeline")
-print("pipeline = ExpressionPipeline()")
-print("pipeline.load_data('data.csv')")
-print("pipeline.train_model()")
-print("results = pipeline.interpret('bpnet', n_genes=5)")
-print("```")
-
-print("\n📦 2. MODULAR PACKAGE STRUCTURE:")
 structure_summary = """
 rna-seq-factornet/
 ├── rna_seq_factornet/          # Main package
@@ -59,9 +47,7 @@ rna-seq-factornet/
 ├── .gitignore                  # Git ignore patterns
 └── CONTRIBUTING.md             # Contributing guidelines
 """
-print(structure_summary)
 
-print("\n📦 3. GITHUB REPOSITORY FEATURES:")
 features = """
 ✅ Professional README with badges
 ✅ Comprehensive documentation 
@@ -74,9 +60,7 @@ features = """
 ✅ Code formatting configuration
 ✅ Proper .gitignore patterns
 """
-print(features)
 
-print("\n🚀 4. USAGE EXAMPLES:")
 usage_examples = """
 # Method 1: Simple pipeline
 from rna_seq_factornet import ExpressionPipeline
@@ -95,9 +79,7 @@ from rna_seq_factornet.interpretation import SaliencyMethods
 model = ExpressionFactorNet(n_features=50)
 interpreter = SaliencyMethods(model)
 """
-print(usage_examples)
 
-print("\n📊 5. GITHUB BEST PRACTICES IMPLEMENTED:")
 best_practices = """
 ✅ Clear project description and features
 ✅ Installation instructions
@@ -113,9 +95,7 @@ best_practices = """
 ✅ Code quality tools
 ✅ Documentation structure
 """
-print(best_practices)
 
-print("\n🎯 6. NEXT STEPS FOR GITHUB:")
 next_steps = """
 1. Create GitHub repository
 2. Upload all the generated files
@@ -126,4 +106,30 @@ next_steps = """
 7. Add issue templates
 8. Set up GitHub Pages for docs
 """
-print(next_steps)
\ No newline at end of file
+
+
+if __name__ == "__main__":
+    # Emit the whole report in a single write
+    sys.stdout.write("\n".join([
+        "🎯 COMPLETE MODULAR RNA-SEQ FACTORNET PACKAGE",
+        "=" * 70,
+        "\n📦 1. SIMPLE IMPORT STRUCTURE:",
+        "```python",
+        "# Simple 3-line usage",
+        "from rna_seq_factornet import ExpressionPipeline",
+        "pipeline = ExpressionPipeline()",
+        "pipeline.load_data('data.csv')",
+        "pipeline.train_model()",
+        "results = pipeline.interpret('bpnet', n_genes=5)",
+        "```",
+        "\n📦 2. MODULAR PACKAGE STRUCTURE:",
+        structure_summary,
+        "\n📦 3. GITHUB REPOSITORY FEATURES:",
+        features,
+        "\n🚀 4. USAGE EXAMPLES:",
+        usage_examples,
+        "\n📊 5. GITHUB BEST PRACTICES IMPLEMENTED:",
+        best_practices,
+        "\n🎯 6. NEXT STEPS FOR GITHUB:",
+        next_steps,
+    ]) + "\n")
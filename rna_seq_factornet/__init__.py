@@ -33,15 +33,35 @@ Advanced Usage:
     ```
 """
 
-from .pipeline.core import ExpressionPipeline
-from .models.factornet import ExpressionFactorNet
-from .data.loader import ExpressionDataLoader
-from .interpretation.methods import (
-    IntegratedGradients,
-    SaliencyMethods, 
-    BPNetContributions
-)
-from .interpretation.visualizer import InterpretabilityVisualizer
+import importlib
+import logging
+
+# Library logging stays silent unless the application configures handlers
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
+# Public names are imported on first access (PEP 562) so that
+# `import rna_seq_factornet` does not pull in TensorFlow or matplotlib
+_LAZY_IMPORTS = {
+    'ExpressionPipeline': '.pipeline.core',
+    'ExpressionFactorNet': '.models.factornet',
+    'ExpressionDataLoader': '.data.loader',
+    'IntegratedGradients': '.interpretation.methods',
+    'SaliencyMethods': '.interpretation.methods',
+    'BPNetContributions': '.interpretation.methods',
+    'InterpretabilityVisualizer': '.interpretation.visualizer',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
 # Simple high-level API
 __all__ = [
@@ -69,7 +89,8 @@ __author__ = "ML Utility Generator"
 __email__ = "your.email@example.com"
 __description__ = "RNA-seq expression analysis with deep learning and interpretability"
 
-def quick_analysis(data_file, method='bpnet', n_genes=5, save_plots=True):
+def quick_analysis(data_file, method='bpnet', n_genes=5, save_plots=True,
+                   ig_batch_size=None, steps=25, schedule='gauss'):
     """
     Quick analysis function for immediate results
     
@@ -78,17 +99,27 @@ def quick_analysis(data_file, method='bpnet', n_genes=5, save_plots=True):
         method: Interpretation method ('bpnet', 'saliency', 'integrated_gradients')
         n_genes: Number of genes to analyze
         save_plots: Whether to save visualization plots
+        ig_batch_size: Interpolation rows per forward pass for integrated
+            gradients (None uses the interpret() batch_size)
+        steps: Number of integrated gradients interpolation points
+        schedule: Integrated gradients step schedule ('uniform', 'gauss')
         
     Returns:
         Tuple of (pipeline, interpretation_results)
     """
+    from .pipeline.core import ExpressionPipeline
+    
     pipeline = ExpressionPipeline()
     pipeline.load_data(data_file)
     pipeline.train_model()
-    results = pipeline.interpret(method, n_genes=n_genes)
+    options = {}
+    if method == 'integrated_gradients':
+        options = dict(ig_batch_size=ig_batch_size, steps=steps, schedule=schedule)
+    results = pipeline.interpret(method, n_genes=n_genes, **options)
     
     if save_plots:
         pipeline.visualize(results)
+        pipeline.join()
     
     return pipeline, results
 
@@ -96,24 +127,35 @@ def load_example_data():
     """
     Load example synthetic data for testing
     
+    The file is only generated once; later calls return the existing path.
+    
     Returns:
         Path to example data file
     """
+    from pathlib import Path
     import numpy as np
     import pandas as pd
     
+    example_file = "example_expression_data.csv"
+    if Path(example_file).exists():
+        return example_file
+    
     # Generate example data
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     n_genes, n_samples = 100, 20
     
-    gene_names = [f"Gene_{i:03d}" for i in range(n_genes)]
-    sample_names = [f"Sample_{i:02d}" for i in range(n_samples)]
+    # Names built with NumPy string ufuncs, no per-name Python loop
+    gene_names = pd.Index(np.char.add("Gene_", np.char.zfill(np.arange(n_genes).astype("U"), 3)))
+    sample_names = pd.Index(np.char.add("Sample_", np.char.zfill(np.arange(n_samples).astype("U"), 2)))
     
-    # Log-normal expression data
-    data = np.random.lognormal(2, 1, (n_genes, n_samples))
+    # Log-normal expression data (mean=2, sigma=1), drawn straight into a
+    # C-contiguous float32 buffer with no float64 intermediate
+    data = np.empty((n_genes, n_samples), dtype=np.float32, order='C')
+    rng.standard_normal(out=data, dtype=np.float32)
+    data += 2.0
+    np.exp(data, out=data)
     df = pd.DataFrame(data, index=gene_names, columns=sample_names)
     
-    example_file = "example_expression_data.csv"
     df.to_csv(example_file)
     
-    return example_file
\ No newline at end of file
+    return example_file
@@ -3,15 +3,96 @@
 Main pipeline for RNA-seq expression analysis with simple, clean API
 """
 
+import contextlib
+import hashlib
+import json
+import logging
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, fields
 import numpy as np
-import pandas as pd
 from pathlib import Path
-from typing import Dict, Optional, Union, List
+from typing import Dict, Iterable, Iterator, List, Optional, Protocol, Tuple, Union
 
+from .. import __version__
 from ..data.loader import ExpressionDataLoader
 from ..models.factornet import ExpressionFactorNet
-from ..interpretation.methods import InterpretationMethods
-from ..interpretation.visualizer import InterpretabilityVisualizer
+from ..interpretation.methods import (GRADIENT_ATTRIBUTIONS, InterpretationMethods,
+                                      attributions_from_gradients)
+from ..utils.persistence import intern_names, load_data_arrays, save_data_arrays
+
+# Methods that are all derived from the same input gradient
+GRADIENT_METHODS = set(GRADIENT_ATTRIBUTIONS)
+
+# Options accepted by interpret(**kwargs) for integrated gradients
+IG_OPTIONS = ('steps', 'schedule', 'ig_batch_size', 'reduce_on_device')
+
+# Pipeline precision -> Keras mixed precision policy
+PRECISION_POLICIES = {
+    'fp32': 'float32',
+    'fp16': 'mixed_float16',
+    'bf16': 'mixed_bfloat16',
+}
+
+
+@dataclass
+class ModelParams:
+    """Architecture hyperparameters passed to ExpressionFactorNet"""
+    conv_filters: int = 32
+    conv_kernel_size: int = 15
+    lstm_units: int = 32
+    dense_units: int = 64
+    dropout_rate: float = 0.3
+
+
+MODEL_PARAM_NAMES = {f.name for f in fields(ModelParams)}
+
+
+class FactorNetModel(Protocol):
+    """
+    What the pipeline relies on from ExpressionFactorNet
+    
+    The pipeline passes NumPy arrays and scalar options only; batching,
+    input pipelines and fold parallelism are the model wrapper's concern.
+    Instances are built as ExpressionFactorNet(n_features=..., **ModelParams).
+    """
+    
+    def train(self, X: np.ndarray, y: np.ndarray, epochs: int, batch_size: int) -> Dict:
+        """Train on all data"""
+    
+    def train_with_cv(self, X: np.ndarray, y: np.ndarray, k_folds: int, epochs: int,
+                      batch_size: int, n_jobs: int) -> Dict:
+        """
+        k-fold cross-validation, training up to n_jobs folds in parallel
+        
+        Returns a dict with at least 'mean_r2' and 'std_r2'.
+        """
+    
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """Model outputs for a (n_genes, n_samples) feature array"""
+    
+    def save_model(self, filepath: str):
+        """Write the trained model to filepath"""
+    
+    def load_model(self, filepath: str):
+        """Restore a model written by save_model"""
+
+
+def _check_options(method: str, kwargs: Dict, allowed: Iterable[str]):
+    """Reject method options that would otherwise be silently ignored"""
+    unknown = sorted(set(kwargs) - set(allowed))
+    if unknown:
+        raise ValueError(f"Unknown options {unknown} for '{method}', "
+                         f"expected any of {list(allowed)}")
+
+
+def _checked_pair(method: str, result) -> Tuple[np.ndarray, np.ndarray]:
+    """Return an interpreter result, which must be an (importance, y_hat) pair"""
+    if not (isinstance(result, tuple) and len(result) == 2):
+        raise TypeError(f"Interpreter method for '{method}' must return (importance, y_hat) "
+                        f"as defined by InterpretationMethods, got {type(result).__name__}")
+    return result
+
 
 class ExpressionPipeline:
     """
@@ -27,23 +108,73 @@ class ExpressionPipeline:
         ```
     """
     
-    def __init__(self, cache_dir: str = "./cache"):
-        """Initialize pipeline"""
+    def __init__(self, cache_dir: str = "./cache", precision: str = 'fp32',
+                 verbose: bool = True):
+        """
+        Initialize pipeline
+        
+        Args:
+            cache_dir: Directory for cached data
+            precision: Compute precision for training and interpretation
+                ('fp32', 'fp16', 'bf16'); 'fp16'/'bf16' use Keras mixed
+                precision with float32 variables
+            verbose: Log progress messages at INFO level for this pipeline.
+                If the application has not configured logging, they are
+                printed to stderr; otherwise they propagate to its handlers.
+        """
+        if precision not in PRECISION_POLICIES:
+            raise ValueError(f"Unknown precision '{precision}', "
+                             f"expected one of {list(PRECISION_POLICIES)}")
+        
+        self.precision = precision
+        
+        # Per-instance child logger, so one pipeline's verbosity never
+        # changes another's; reset it in case id(self) was recycled
+        self._log = logging.getLogger(f"{__name__}.{id(self):x}")
+        self._log.handlers.clear()
+        self._log.propagate = True
+        self._log.setLevel(logging.INFO if verbose else logging.WARNING)
+        if verbose and not logging.getLogger().handlers:
+            # No logging configured by the application: show progress on stderr
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._log.addHandler(handler)
+            self._log.propagate = False
+        
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
         
         self.loader = ExpressionDataLoader(str(self.cache_dir))
-        self.model = None
+        self.model: Optional[FactorNetModel] = None
+        self.model_params = {}
         self.data = None
         self.interpreter = None
-        self.visualizer = InterpretabilityVisualizer()
+        self._method_fns = {}
+        self._visualizer = None
         
-        print("🧬 RNA-seq FactorNet Pipeline initialized")
+        # Background PNG writer so plotting is not blocked on savefig
+        self._io_pool = ThreadPoolExecutor(max_workers=2)
+        self._io_futures = []
+        
+        self._log.info("RNA-seq FactorNet pipeline initialized")
+    
+    @property
+    def visualizer(self):
+        """Visualizer, created on first use so matplotlib is only imported when plotting"""
+        if self._visualizer is None:
+            from ..interpretation.visualizer import InterpretabilityVisualizer
+            self._visualizer = InterpretabilityVisualizer()
+        return self._visualizer
+    
+    @visualizer.setter
+    def visualizer(self, visualizer):
+        self._visualizer = visualizer
     
     def load_data(self, filepath: str, 
                   nan_strategy: str = 'remove',
                   min_expression: float = 0.5,
                   feature_selection: str = 'variance',
+                  use_cache: bool = True,
                   **kwargs) -> Dict:
         """
         Load and preprocess expression data
@@ -53,12 +184,41 @@ class ExpressionPipeline:
             nan_strategy: How to handle NaN values ('remove', 'fill_zero', 'fill_mean', 'fill_median')
             min_expression: Minimum expression threshold
             feature_selection: Feature selection method ('variance', 'mean', 'all')
+            use_cache: Reuse a memory-mapped copy of previously processed data.
+                The cache is keyed on the file's size and mtime, the
+                preprocessing arguments and the package version, so edits to
+                the source or a new release invalidate it. Whenever the data
+                is cached, a miss returns the freshly written cache as well,
+                so arrays are copy-on-write memmaps either way: they can be
+                modified in place without touching the cache.
             **kwargs: Additional arguments for data loading
             
         Returns:
             Processed data dictionary
         """
-        print(f"📊 Loading data from {filepath}...")
+        self._log.info("Loading data from %s...", filepath)
+        
+        cache_path = None
+        if use_cache:
+            stat = Path(filepath).stat()
+            key = json.dumps({
+                'path': str(Path(filepath).resolve()),
+                'size': stat.st_size,
+                'mtime': stat.st_mtime_ns,
+                'nan_strategy': nan_strategy,
+                'min_expression': min_expression,
+                'feature_selection': feature_selection,
+                'kwargs': kwargs,
+                'version': __version__
+            }, sort_keys=True, default=str)
+            cache_path = self.cache_dir / f"data_{hashlib.sha1(key.encode()).hexdigest()[:16]}"
+            
+            if (cache_path / "meta.json").exists():
+                self.data = intern_names(load_data_arrays(cache_path, mmap_mode='c'))
+                self._log.info("Data loaded from cache: %d genes, %d samples",
+                               len(self.data['gene_names']),
+                               self.data['preprocessing_params']['n_features'])
+                return self.data
         
         # Load raw data
         raw_data = self.loader.load_expression_data(
@@ -74,8 +234,25 @@ class ExpressionPipeline:
             feature_selection=feature_selection
         )
         
-        print(f"✅ Data loaded: {len(self.data['gene_names'])} genes, "
-              f"{self.data['preprocessing_params']['n_features']} samples")
+        # C-contiguous features make every gene slice a zero-copy view
+        self.data['expression_features'] = np.ascontiguousarray(self.data['expression_features'])
+        intern_names(self.data)
+        
+        if cache_path is not None:
+            try:
+                save_data_arrays(self.data, cache_path)
+            except TypeError:
+                # Entries that would not round-trip: skip caching rather than fail the load
+                self._log.info("Data not cached: contains entries that cannot be stored")
+            except OSError as error:
+                # Read-only or full cache_dir: the data is already processed
+                self._log.warning("Data not cached: %s", error)
+            else:
+                self.data = intern_names(load_data_arrays(cache_path, mmap_mode='c'))
+        
+        self._log.info("Data loaded: %d genes, %d samples",
+                       len(self.data['gene_names']),
+                       self.data['preprocessing_params']['n_features'])
         
         return self.data
     
@@ -83,6 +260,7 @@ class ExpressionPipeline:
                    use_cv: bool = True,
                    k_folds: int = 5,
                    epochs: int = 50,
+                   n_jobs: Optional[int] = None,
                    **model_params) -> Dict:
         """
         Train the FactorNet model
@@ -91,7 +269,13 @@ class ExpressionPipeline:
             use_cv: Whether to use cross-validation
             k_folds: Number of CV folds
             epochs: Number of training epochs
-            **model_params: Model architecture parameters
+            n_jobs: Number of CV folds trained in parallel worker processes
+                (None = 1 when a GPU is visible, otherwise one per fold).
+                Multi-GPU runs need CUDA_VISIBLE_DEVICES sharding per worker.
+                Always 1 with 'fp16'/'bf16' precision, since worker processes
+                do not inherit the mixed precision policy.
+            **model_params: Model architecture parameters (see ModelParams)
+                and batch_size (default 16)
             
         Returns:
             Training results
@@ -99,55 +283,82 @@ class ExpressionPipeline:
         if self.data is None:
             raise ValueError("Load data first using load_data()")
         
-        print("🤖 Training FactorNet model...")
+        self._log.info("Training FactorNet model...")
         
         # Initialize model
         n_features = self.data['preprocessing_params']['n_features']
         
-        # Set default small model for speed
-        default_params = {
-            'conv_filters': 32,
-            'lstm_units': 32,
-            'dense_units': 64,
-            'batch_size': 16
-        }
-        default_params.update(model_params)
+        # ModelParams defaults are a small model for speed
+        batch_size = model_params.pop('batch_size', 16)
+        params = ModelParams(**{k: v for k, v in model_params.items() if k in MODEL_PARAM_NAMES})
         
-        self.model = ExpressionFactorNet(n_features=n_features, **{
-            k: v for k, v in default_params.items() 
-            if k in ['conv_filters', 'conv_kernel_size', 'lstm_units', 'dense_units', 'dropout_rate']
-        })
+        self.model_params = asdict(params)
         
-        # Train
         X = self.data['expression_features']
         y = self.data['expression_targets']
         
-        if use_cv:
-            results = self.model.train_with_cv(
-                X, y, k_folds=k_folds, epochs=epochs,
-                batch_size=default_params.get('batch_size', 16)
-            )
-            print(f"✅ CV completed: R² = {results['mean_r2']:.3f} ± {results['std_r2']:.3f}")
-        else:
-            results = self.model.train(
-                X, y, epochs=epochs, 
-                batch_size=default_params.get('batch_size', 16)
-            )
-            print("✅ Training completed")
+        # Fold models built in this process (n_jobs=1) see the global policy,
+        # so it spans training too; worker processes never inherit it, hence
+        # mixed precision trains folds serially
+        with self._precision_policy():
+            self.model = ExpressionFactorNet(n_features=n_features, **self.model_params)
+            
+            # Train
+            if use_cv:
+                if self.precision != 'fp32':
+                    if n_jobs not in (None, 1):
+                        self._log.warning("precision=%r trains CV folds serially; ignoring n_jobs=%d",
+                                          self.precision, n_jobs)
+                    n_jobs = 1
+                elif n_jobs is None:
+                    # Fold workers would all compete for the same GPU
+                    import tensorflow as tf
+                    n_jobs = 1 if tf.config.list_physical_devices('GPU') else k_folds
+                
+                results = self.model.train_with_cv(
+                    X, y, k_folds=k_folds, epochs=epochs,
+                    batch_size=batch_size,
+                    n_jobs=n_jobs
+                )
+                self._log.info("CV completed: R2 = %.3f +/- %.3f",
+                               results['mean_r2'], results['std_r2'])
+            else:
+                results = self.model.train(
+                    X, y, epochs=epochs, 
+                    batch_size=batch_size
+                )
+                self._log.info("Training completed")
         
         # Initialize interpreter
-        self.interpreter = InterpretationMethods(self.model)
+        self._bind_interpreter()
         
         return results
     
-    def interpret(self, method: str = 'bpnet', n_genes: int = 5, **kwargs) -> Dict:
+    def interpret(self, method: str = 'bpnet', n_genes: int = 5,
+                  batch_size: int = 128, targets: Optional[np.ndarray] = None,
+                  **kwargs) -> Dict:
         """
         Interpret model predictions
         
+        All selected genes go to the interpreter in one batched call; for
+        integrated gradients the stacked (n_genes * steps) interpolations are
+        evaluated in chunks of batch_size rows. Predictions come from the
+        interpreter's own forward pass, so no separate predict() is run.
+        
         Args:
             method: Interpretation method ('bpnet', 'saliency', 'integrated_gradients', 'gradients')
             n_genes: Number of genes to analyze
-            **kwargs: Method-specific parameters
+            batch_size: Maximum rows per forward/backward pass
+            targets: Model output indices to attribute. All targets share one
+                gradient pass and feature_importance gains a target axis,
+                (n_genes, n_targets, ...); None attributes the scalar output
+            **kwargs: Method-specific parameters. For 'integrated_gradients':
+                steps (default 50), schedule ('uniform' or 'gauss', see
+                integration_schedule), ig_batch_size, which overrides
+                batch_size for the interpolation batches, and reduce_on_device
+                (default True), which accumulates the Riemann sum on the
+                accelerator and transfers only the (n_genes, ...) result.
+                Other methods take no options; unknown options raise ValueError
             
         Returns:
             Interpretation results
@@ -155,84 +366,319 @@ class ExpressionPipeline:
         if self.interpreter is None:
             raise ValueError("Train model first using train_model()")
         
-        print(f"🔍 Running {method} interpretation on {n_genes} genes...")
+        self._log.info("Running %s interpretation on %d genes...", method, n_genes)
         
         # Select genes
-        n_genes = min(n_genes, len(self.data['gene_names']))
-        features = self.data['expression_features'][:n_genes]
+        n_genes, features = self._select_genes(n_genes)
         
         # Run interpretation
-        if method == 'bpnet':
-            importance = self.interpreter.bpnet_contribution_scores(features)
-        elif method == 'saliency':
-            importance = self.interpreter.saliency_gradients(features)
-        elif method == 'integrated_gradients':
-            steps = kwargs.get('steps', 50)
-            importance = self.interpreter.integrated_gradients_scores(features, steps=steps)
-        else:  # gradients
-            importance = self.interpreter.standard_gradients(features)
+        importance, predictions = self._run_method(method, features, batch_size=batch_size,
+                                                   targets=targets, **kwargs)
         
         results = {
             'method': method,
             'feature_importance': importance,
             'gene_names': self.data['gene_names'][:n_genes],
             'sample_names': self.data['sample_names'],
-            'predictions': self.model.predict(features)
+            'predictions': predictions
         }
         
-        print(f"✅ {method.title()} interpretation completed")
+        self._log.info("%s interpretation completed", method.title())
         return results
     
-    def visualize(self, results: Dict, gene_idx: int = 0, save_dir: Optional[str] = None):
+    def iter_interpret(self, method: str = 'bpnet', n_genes: int = 5,
+                       batch_size: int = 128,
+                       **kwargs) -> Iterator[Tuple[int, np.ndarray]]:
+        """
+        Interpret genes one at a time
+        
+        Yields per-gene attributions instead of holding every gene's map in
+        memory, so peak usage stays at one gene regardless of n_genes.
+        
+        Args:
+            method: Interpretation method (see interpret())
+            n_genes: Number of genes to analyze
+            batch_size: Maximum rows per forward/backward pass
+            **kwargs: Method-specific parameters (see interpret())
+            
+        Yields:
+            Tuples of (gene_idx, feature_importance) for each gene
+        """
+        if self.interpreter is None:
+            raise ValueError("Train model first using train_model()")
+        
+        n_genes = min(n_genes, len(self.data['gene_names']))
+        features = np.asarray(self.data['expression_features'])
+        
+        for gene_idx in range(n_genes):
+            importance, _ = self._run_method(method, features[gene_idx:gene_idx + 1],
+                                             batch_size=batch_size, **kwargs)
+            yield gene_idx, np.asarray(importance)[0]
+            del importance
+    
+    def _select_genes(self, n_genes: int) -> Tuple[int, np.ndarray]:
+        """Clip n_genes and return a zero-copy view of the first n_genes rows"""
+        n_genes = min(n_genes, len(self.data['gene_names']))
+        return n_genes, np.asarray(self.data['expression_features'])[:n_genes]
+    
+    def _run_method(self, method: str, features: np.ndarray,
+                    batch_size: int = 128,
+                    **kwargs) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Dispatch a batch of features to the interpreter
+        
+        Returns:
+            Tuple of (importance, predictions)
+        """
+        return self._dispatch(method, self._interpreter_input(features),
+                              batch_size=batch_size, **kwargs)
+    
+    def _interpreter_input(self, features: np.ndarray) -> np.ndarray:
+        """Features as sent to the interpreter: float16 on the host for fp16"""
+        if self.precision == 'fp16':
+            return features.astype(np.float16)
+        return features
+    
+    @contextlib.contextmanager
+    def _precision_policy(self):
+        """Apply this pipeline's Keras dtype policy, restoring the previous one on exit"""
+        if self.precision == 'fp32' and 'tensorflow' not in sys.modules:
+            # TensorFlow not imported yet, so the global policy is still float32
+            yield
+            return
+        
+        import tensorflow as tf
+        previous = tf.keras.mixed_precision.global_policy()
+        tf.keras.mixed_precision.set_global_policy(PRECISION_POLICIES[self.precision])
+        try:
+            yield
+        finally:
+            tf.keras.mixed_precision.set_global_policy(previous)
+    
+    def _bind_interpreter(self):
+        """
+        Create the interpreter and its method lookup table for the current model
+        
+        Every entry takes (features, batch_size, target_indices, **kwargs) and
+        rejects options it does not understand. The gradient-derived methods
+        all come from standard_gradients, exactly as in compare_methods.
+        """
+        self.interpreter = InterpretationMethods(self.model)
+        
+        def from_gradients(name):
+            def run(features, batch_size, target_indices, **kwargs):
+                _check_options(name, kwargs, ())
+                grads, y_hat = _checked_pair('gradients', self.interpreter.standard_gradients(
+                    features, batch_size=batch_size, target_indices=target_indices))
+                return attributions_from_gradients(name, grads, features), y_hat
+            return run
+        
+        def integrated_gradients(features, batch_size, target_indices, **kwargs):
+            _check_options('integrated_gradients', kwargs, IG_OPTIONS)
+            return self.interpreter.integrated_gradients_scores(
+                features, steps=kwargs.get('steps', 50),
+                schedule=kwargs.get('schedule', 'uniform'),
+                batch_size=kwargs.get('ig_batch_size') or batch_size,
+                reduce_on_device=kwargs.get('reduce_on_device', True),
+                target_indices=target_indices
+            )
+        
+        self._method_fns = {
+            'bpnet': from_gradients('bpnet'),
+            'saliency': from_gradients('saliency'),
+            'integrated_gradients': integrated_gradients,
+            'gradients': from_gradients('gradients'),
+        }
+    
+    def _dispatch(self, method: str, features: np.ndarray,
+                  batch_size: int = 128, targets: Optional[np.ndarray] = None,
+                  **kwargs) -> Tuple[np.ndarray, np.ndarray]:
+        """Call the interpreter method for `method`, returning (importance, predictions)"""
+        fn = self._method_fns.get(method)
+        if fn is None:
+            raise ValueError(f"Unknown interpretation method '{method}', "
+                             f"expected one of {list(self._method_fns)}")
+        
+        return _checked_pair(method, fn(features, batch_size, targets, **kwargs))
+    
+    def visualize(self, results: Union[Dict, Iterable[Tuple[int, np.ndarray]]],
+                  gene_idx: int = 0, save_dir: Optional[str] = None,
+                  method: Optional[str] = None):
         """
         Create visualizations for interpretation results
         
+        Figures are released from pyplot as soon as they are drawn and written
+        to save_dir in the background; call join() to wait for all pending
+        writes. Writes that failed since the last call are raised here.
+        
         Args:
-            results: Results from interpret()
+            results: Results from interpret(), or the (gene_idx, importance)
+                stream from iter_interpret(). A stream is rendered one
+                contribution profile per gene, without the multi-gene heatmap.
             gene_idx: Index of gene to visualize
             save_dir: Directory to save plots
+            method: Method name for plot titles; required for streams
         """
-        print("📊 Creating visualizations...")
+        done = [f for f in self._io_futures if f.done()]
+        self._io_futures = [f for f in self._io_futures if not f.done()]
+        self._raise_write_failures(done)
+        
+        self._log.info("Creating visualizations...")
+        
+        if save_dir:
+            Path(save_dir).mkdir(parents=True, exist_ok=True)
+        
+        if not isinstance(results, dict):
+            if method is None:
+                raise ValueError("method is required when visualizing a stream from iter_interpret()")
+            
+            title = method.replace('_', ' ').title()
+            for idx, importance in results:
+                gene_name = self.data['gene_names'][idx]
+                fig = self.visualizer.plot_contribution_profile(
+                    importance,
+                    gene_name,
+                    self.data['sample_names'],
+                    title
+                )
+                self._save_figure(fig, f"{save_dir}/{gene_name}_{method}.png" if save_dir else None)
+            
+            self._log.info("Visualizations created")
+            return
         
         # Individual gene plot
-        self.visualizer.plot_contribution_profile(
+        fig = self.visualizer.plot_contribution_profile(
             results['feature_importance'][gene_idx],
             results['gene_names'][gene_idx],
             results['sample_names'],
-            results['method'].replace('_', ' ').title(),
-            save_path=f"{save_dir}/{results['gene_names'][gene_idx]}_{results['method']}.png" if save_dir else None
+            results['method'].replace('_', ' ').title()
+        )
+        self._save_figure(
+            fig,
+            f"{save_dir}/{results['gene_names'][gene_idx]}_{results['method']}.png" if save_dir else None
         )
         
         # Heatmap for all genes
-        self.visualizer.plot_contribution_heatmap(
+        fig = self.visualizer.plot_contribution_heatmap(
             results['feature_importance'],
             results['gene_names'],
             results['sample_names'],
-            results['method'].replace('_', ' ').title(),
-            save_path=f"{save_dir}/heatmap_{results['method']}.png" if save_dir else None
+            results['method'].replace('_', ' ').title()
         )
+        self._save_figure(fig, f"{save_dir}/heatmap_{results['method']}.png" if save_dir else None)
         
-        print("✅ Visualizations created")
+        self._log.info("Visualizations created")
     
-    def compare_methods(self, methods: List[str] = None, n_genes: int = 3) -> Dict:
+    def _save_figure(self, fig, save_path: Optional[str]):
+        """Release a figure from pyplot and queue it for writing on the I/O pool"""
+        # pyplot's figure registry is not thread-safe, so the figure is
+        # closed here on the caller's thread; savefig works on closed figures
+        import matplotlib.pyplot as plt
+        plt.close(fig)
+        if save_path is None:
+            return
+        
+        self._io_futures = [f for f in self._io_futures if not f.done() or f.exception()]
+        self._io_futures.append(self._io_pool.submit(fig.savefig, save_path, dpi=100))
+    
+    def _raise_write_failures(self, futures: List):
+        """Raise the first failed figure write among finished futures, logging the rest"""
+        errors = [f.exception() for f in futures if f.exception() is not None]
+        for error in errors[1:]:
+            self._log.error("Figure write failed", exc_info=error)
+        if errors:
+            raise errors[0]
+    
+    def join(self):
+        """Wait for all pending figure writes, raising the first failure and logging the rest"""
+        futures, self._io_futures = self._io_futures, []
+        for future in futures:
+            future.exception()  # wait without raising
+        self._raise_write_failures(futures)
+    
+    def compare_methods(self, methods: List[str] = None, n_genes: int = 3,
+                        batch_size: int = 128,
+                        targets: Optional[np.ndarray] = None) -> Dict:
         """
         Compare multiple interpretation methods
         
+        Two or more of 'saliency', 'gradients' and 'bpnet' are derived from a
+        single shared gradient pass, with the same definitions interpret()
+        uses; that pass and the remaining methods run concurrently in a thread
+        pool against the same model.
+        
         Args:
             methods: List of methods to compare
             n_genes: Number of genes to analyze
+            batch_size: Maximum rows per forward/backward pass
+            targets: Model output indices to attribute, shared by every
+                method (see interpret())
             
         Returns:
             Dictionary with results for each method
         """
+        if self.interpreter is None:
+            raise ValueError("Train model first using train_model()")
+        
         if methods is None:
             methods = ['bpnet', 'saliency', 'integrated_gradients']
         
-        print(f"🔬 Comparing {len(methods)} interpretation methods...")
+        self._log.info("Comparing %d interpretation methods...", len(methods))
+        
+        # All method results reference the same name tuples
+        n_genes = min(n_genes, len(self.data['gene_names']))
+        gene_names = self.data['gene_names'][:n_genes]
+        
+        # Gradient-derived methods share a single backward pass
+        shared = [m for m in methods if m in GRADIENT_METHODS]
+        if len(shared) < 2:
+            shared = []
+        others = [m for m in methods if m not in shared]
+        
+        # Each task returns a {method: result} mapping
+        tasks = []
+        if shared:
+            tasks.append(lambda: self._joint_attributions(shared, n_genes, batch_size=batch_size,
+                                                          targets=targets))
+        for method in others:
+            tasks.append(lambda method=method: {
+                method: self.interpret(method, n_genes=n_genes,
+                                       batch_size=batch_size, targets=targets)
+            })
         
+        results = {}
+        if len(tasks) == 1:
+            results.update(tasks[0]())
+        elif tasks:
+            with ThreadPoolExecutor(max_workers=len(tasks)) as pool:
+                for future in [pool.submit(task) for task in tasks]:
+                    results.update(future.result())
+        
+        for result in results.values():
+            result['gene_names'] = gene_names
+        
+        return {method: results[method] for method in methods}
+    
+    def _joint_attributions(self, methods: List[str], n_genes: int,
+                            batch_size: int = 128,
+                            targets: Optional[np.ndarray] = None) -> Dict:
+        """Compute saliency, gradients and BPNet scores from one gradient pass"""
+        n_genes, features = self._select_genes(n_genes)
+        features = self._interpreter_input(features)
+        
+        grads, predictions = self._dispatch('gradients', features, batch_size=batch_size,
+                                            targets=targets)
+        
+        gene_names = self.data['gene_names'][:n_genes]
         results = {}
         for method in methods:
-            results[method] = self.interpret(method, n_genes=n_genes)
+            results[method] = {
+                'method': method,
+                'feature_importance': attributions_from_gradients(method, grads, features),
+                'gene_names': gene_names,
+                'sample_names': self.data['sample_names'],
+                'predictions': predictions
+            }
         
         return results
     
@@ -247,7 +693,13 @@ class ExpressionPipeline:
         return self.model.predict(expression_features)
     
     def save_pipeline(self, filepath: str):
-        """Save the complete pipeline"""
+        """
+        Save the complete pipeline
+        
+        Writes the model (`{filepath}_model`), the data dictionary as one .npy
+        per array plus JSON metadata (`{filepath}_data/`), and the model
+        hyperparameters (`{filepath}_meta.json`).
+        """
         if self.model is None:
             raise ValueError("No model to save")
         
@@ -255,25 +707,49 @@ class ExpressionPipeline:
         self.model.save_model(f"{filepath}_model")
         
         # Save data
-        import pickle
-        with open(f"{filepath}_data.pkl", 'wb') as f:
-            pickle.dump(self.data, f)
+        save_data_arrays(self.data, Path(f"{filepath}_data"))
         
-        print(f"💾 Pipeline saved to {filepath}")
+        with open(f"{filepath}_meta.json", 'w') as f:
+            json.dump({'model_params': self.model_params}, f)
+        
+        self._log.info("Pipeline saved to %s", filepath)
     
-    def load_pipeline(self, filepath: str):
-        """Load a saved pipeline"""
+    def load_pipeline(self, filepath: str, legacy: bool = False):
+        """
+        Load a saved pipeline
+        
+        Data arrays are memory-mapped read-only, so only the rows that are
+        actually used (e.g. the genes passed to interpret()) are read from disk.
+        
+        Args:
+            filepath: Path prefix passed to save_pipeline()
+            legacy: Read the pickled `{filepath}_data.pkl` format written by
+                earlier versions. Loading such a pipeline without it raises
+                ValueError.
+        """
         # Load data
-        import pickle
-        with open(f"{filepath}_data.pkl", 'rb') as f:
-            self.data = pickle.load(f)
+        if legacy:
+            import pickle
+            with open(f"{filepath}_data.pkl", 'rb') as f:
+                self.data = intern_names(pickle.load(f))
+            self.model_params = {}
+        else:
+            data_dir = Path(f"{filepath}_data")
+            if not (data_dir / "meta.json").exists() and Path(f"{filepath}_data.pkl").exists():
+                raise ValueError(f"{filepath} was saved by an earlier version as "
+                                 f"{filepath}_data.pkl; pass legacy=True to load it")
+            self.data = intern_names(load_data_arrays(data_dir, mmap_mode='r'))
+            
+            with open(f"{filepath}_meta.json") as f:
+                self.model_params = asdict(ModelParams(**json.load(f)['model_params']))
         
         # Load model
         n_features = self.data['preprocessing_params']['n_features']
-        self.model = ExpressionFactorNet(n_features=n_features)
-        self.model.load_model(f"{filepath}_model")
+        with self._precision_policy():
+            self.model = ExpressionFactorNet(n_features=n_features, **self.model_params)
+            self.model.load_model(f"{filepath}_model")
         
         # Initialize interpreter
-        self.interpreter = InterpretationMethods(self.model)
+        self._bind_interpreter()
         
-        print(f"📂 Pipeline loaded from {filepath}")
\ No newline at end of file
+        self._log.info("Pipeline loaded from %s", filepath)
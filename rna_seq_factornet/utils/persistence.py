@@ -0,0 +1,166 @@
+# rna_seq_factornet/utils/persistence.py
+"""
+On-disk storage for pipeline data dictionaries
+"""
+
+import importlib.util
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+def _has_pyarrow() -> bool:
+    """Whether pyarrow is available for Feather I/O"""
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+# Data entries holding gene/sample names
+LABEL_KEYS = ('gene_names', 'sample_names')
+
+
+def intern_names(data: Dict) -> Dict:
+    """Store gene/sample names as tuples of interned strings, shared by reference"""
+    for key in LABEL_KEYS:
+        if key in data:
+            data[key] = tuple(map(sys.intern, map(str, data[key])))
+    return data
+
+
+def _is_labels(key: str, value) -> bool:
+    """Whether a data entry is a gene/sample name list to store as Feather"""
+    if key not in LABEL_KEYS:
+        return False
+    if isinstance(value, (pd.Index, np.ndarray)):
+        return value.ndim == 1 and value.dtype.kind in 'UO' and all(isinstance(v, str) for v in value)
+    return isinstance(value, (list, tuple)) and all(isinstance(v, str) for v in value)
+
+
+# Markers for values JSON cannot represent directly
+_TUPLE, _NDARRAY, _SCALAR = '__tuple__', '__ndarray__', '__scalar__'
+
+
+def _split_labels(data: Dict) -> Tuple[Dict, Dict]:
+    """
+    Split a data dictionary into (gene/sample name labels, everything else)
+    
+    Labels are only split out when pyarrow is available to write them as
+    Feather; otherwise they are stored with the rest of the data.
+    """
+    labels = {}
+    if _has_pyarrow():
+        labels = {k: v for k, v in data.items() if _is_labels(k, v)}
+    return labels, {k: v for k, v in data.items() if k not in labels}
+
+
+def _encode(value, path: Tuple, arrays: Dict):
+    """
+    Encode a data entry as JSON, collecting every numeric array into ``arrays``
+    
+    Tuples, NumPy scalars and arrays at any depth are tagged so that decoding
+    returns the same types; anything else JSON cannot round-trip (non-str
+    dict keys, object arrays, pandas objects, ...) raises TypeError.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        name = ".".join(map(str, path))
+        if not re.fullmatch(r"[\w.-]+", name) or name in arrays:
+            name = f"array_{len(arrays)}"
+        arrays[name] = value
+        return {_NDARRAY: name}
+    if isinstance(value, np.generic) and value.dtype.kind in 'biufU':
+        return {_SCALAR: value.item(), 'dtype': value.dtype.str}
+    if isinstance(value, tuple):
+        return {_TUPLE: [_encode(v, path + (i,), arrays) for i, v in enumerate(value)]}
+    if isinstance(value, list):
+        return [_encode(v, path + (i,), arrays) for i, v in enumerate(value)]
+    if isinstance(value, dict):
+        for k in value:
+            if not isinstance(k, str) or k in (_TUPLE, _NDARRAY, _SCALAR):
+                raise TypeError(f"Cannot store dict key {k!r} at {'.'.join(map(str, path))}")
+        return {k: _encode(v, path + (k,), arrays) for k, v in value.items()}
+    raise TypeError(f"Cannot store {type(value).__name__} at {'.'.join(map(str, path))}")
+
+
+def _decode(value, directory: Path, mmap_mode: Optional[str]):
+    """Inverse of _encode, loading tagged arrays from ``directory``"""
+    if isinstance(value, list):
+        return [_decode(v, directory, mmap_mode) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if _NDARRAY in value:
+        return np.load(directory / f"{value[_NDARRAY]}.npy", mmap_mode=mmap_mode)
+    if _SCALAR in value:
+        return np.dtype(value['dtype']).type(value[_SCALAR])
+    if _TUPLE in value:
+        return tuple(_decode(v, directory, mmap_mode) for v in value[_TUPLE])
+    return {k: _decode(v, directory, mmap_mode) for k, v in value.items()}
+
+
+def save_data_arrays(data: Dict, directory: Path):
+    """
+    Save a data dictionary as one .npy file per numeric array (at any
+    nesting depth), one Feather file per name list, plus meta.json for
+    everything else
+    
+    Entries that would not load back as equal objects of the same type
+    raise TypeError before anything is replaced.
+    
+    Files are written to a temporary sibling directory that then replaces
+    ``directory``, so arrays memory-mapped from an earlier save are never
+    truncated in place. meta.json is written last and the old one is removed
+    first, so its presence always marks a complete save.
+    """
+    directory = Path(directory)
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(prefix=f".{directory.name}.", dir=directory.parent))
+    
+    try:
+        labels, rest = _split_labels(data)
+        arrays = {}
+        meta = _encode(rest, (), arrays)
+        for key, value in arrays.items():
+            np.save(tmp / f"{key}.npy", value)
+        for key, value in labels.items():
+            pd.DataFrame({key: np.asarray(value, dtype=str)}).to_feather(tmp / f"{key}.feather")
+        
+        with open(tmp / "meta.json", 'w') as f:
+            json.dump({'arrays': sorted(arrays), 'labels': sorted(labels), 'data': meta}, f)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    
+    old = None
+    if directory.exists():
+        (directory / "meta.json").unlink(missing_ok=True)
+        old = tmp.with_name(tmp.name + ".old")
+        os.replace(directory, old)
+    os.replace(tmp, directory)
+    if old is not None:
+        # Open memmaps keep their (now unlinked) files alive
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def load_data_arrays(directory: Path, mmap_mode: Optional[str] = 'r') -> Dict:
+    """
+    Load a data dictionary written by save_data_arrays
+    
+    With the default ``mmap_mode='r'`` every array is a read-only memmap;
+    gene/sample names stored as Feather load back as tuples of str.
+    """
+    directory = Path(directory)
+    with open(directory / "meta.json") as f:
+        meta = json.load(f)
+    
+    data = _decode(meta['data'], directory, mmap_mode)
+    for key in meta.get('labels', []):
+        data[key] = tuple(pd.read_feather(directory / f"{key}.feather")[key])
+    
+    return data
@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from rna_seq_factornet.interpretation.methods import IG_SCHEDULES, integration_schedule
+
+
+@pytest.mark.parametrize('schedule', IG_SCHEDULES)
+@pytest.mark.parametrize('steps', [1, 4, 25])
+def test_weights_sum_to_one(schedule, steps):
+    alphas, weights = integration_schedule(steps, schedule)
+    assert alphas.shape == weights.shape == (steps,)
+    assert alphas.dtype == weights.dtype == np.float32
+    assert weights.sum() == pytest.approx(1.0, abs=1e-6)
+
+
+@pytest.mark.parametrize('steps', [1, 3, 8])
+def test_gauss_is_exact_for_polynomials(steps):
+    alphas, weights = integration_schedule(steps, 'gauss')
+    alphas, weights = alphas.astype(np.float64), weights.astype(np.float64)
+    for degree in range(2 * steps):
+        # Integral of x**d over [0, 1]
+        assert np.dot(weights, alphas ** degree) == pytest.approx(1.0 / (degree + 1), rel=1e-5)
+
+
+def test_uniform_points_are_right_riemann_sum():
+    alphas, weights = integration_schedule(5, 'uniform')
+    np.testing.assert_allclose(alphas, np.arange(1, 6) / 5)
+    np.testing.assert_allclose(weights, 0.2)
+
+
+@pytest.mark.parametrize('steps', [0, -1])
+def test_rejects_too_few_steps(steps):
+    with pytest.raises(ValueError, match="at least 1"):
+        integration_schedule(steps)
+
+
+def test_rejects_unknown_schedule():
+    with pytest.raises(ValueError, match="Unknown schedule"):
+        integration_schedule(10, 'trapezoid')
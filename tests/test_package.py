@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import rna_seq_factornet
+from rna_seq_factornet import load_example_data
+
+
+def test_import_is_lightweight():
+    code = ("import sys, rna_seq_factornet; "
+            "print(any(m in sys.modules for m in ('tensorflow', 'matplotlib')))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                         check=True, cwd=os.path.dirname(os.path.dirname(rna_seq_factornet.__file__)))
+    assert out.stdout.strip() == "False"
+
+
+def test_unknown_attribute_raises():
+    with pytest.raises(AttributeError, match="no_such_name"):
+        rna_seq_factornet.no_such_name
+
+
+@pytest.fixture
+def written(monkeypatch):
+    """Capture the DataFrames load_example_data writes"""
+    frames = []
+    to_csv = pd.DataFrame.to_csv
+    
+    def capture(self, *args, **kwargs):
+        frames.append(self)
+        return to_csv(self, *args, **kwargs)
+    
+    monkeypatch.setattr(pd.DataFrame, 'to_csv', capture)
+    return frames
+
+
+def test_example_data_is_float32_with_padded_names(tmp_path, monkeypatch, written):
+    monkeypatch.chdir(tmp_path)
+    assert load_example_data() == "example_expression_data.csv"
+    
+    df, = written
+    assert df.shape == (100, 20)
+    assert (df.dtypes == np.float32).all()
+    assert df.index[0] == "Gene_000" and df.index[-1] == "Gene_099"
+    assert df.columns[0] == "Sample_00" and df.columns[-1] == "Sample_19"
+    assert (df.to_numpy() > 0).all()
+
+
+def test_example_data_is_deterministic(tmp_path, monkeypatch):
+    contents = []
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        monkeypatch.chdir(tmp_path / name)
+        contents.append((tmp_path / name / load_example_data()).read_bytes())
+    assert contents[0] == contents[1]
+
+
+def test_example_data_returns_existing_file(tmp_path, monkeypatch, written):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "example_expression_data.csv").write_text("existing")
+    
+    assert load_example_data() == "example_expression_data.csv"
+    assert not written
+    assert (tmp_path / "example_expression_data.csv").read_text() == "existing"
@@ -0,0 +1,129 @@
+import json
+
+import numpy as np
+import pytest
+
+from rna_seq_factornet.utils import persistence
+from rna_seq_factornet.utils.persistence import intern_names, load_data_arrays, save_data_arrays
+
+
+def _data():
+    return {
+        'expression_features': np.arange(12, dtype=np.float32).reshape(3, 4),
+        'gene_names': ('Gene_000', 'Gene_001', 'Gene_002'),
+        'sample_names': ('Sample_00', 'Sample_01', 'Sample_02', 'Sample_03'),
+        'preprocessing_params': {'n_features': 4, 'nan_strategy': 'zero'},
+    }
+
+
+def test_arrays_round_trip_as_memmap(tmp_path):
+    data = _data()
+    save_data_arrays(data, tmp_path / "data")
+    
+    loaded = load_data_arrays(tmp_path / "data", mmap_mode='r')
+    features = loaded['expression_features']
+    assert isinstance(features, np.memmap)
+    assert not features.flags.writeable
+    np.testing.assert_array_equal(features, data['expression_features'])
+    assert features.dtype == np.float32
+
+
+def test_labels_round_trip_through_feather(tmp_path):
+    pytest.importorskip('pyarrow')
+    data = _data()
+    save_data_arrays(data, tmp_path / "data")
+    
+    assert (tmp_path / "data" / "gene_names.feather").exists()
+    assert (tmp_path / "data" / "sample_names.feather").exists()
+    loaded = intern_names(load_data_arrays(tmp_path / "data"))
+    assert loaded['gene_names'] == data['gene_names']
+    assert loaded['sample_names'] == data['sample_names']
+
+
+def test_labels_without_pyarrow(tmp_path, monkeypatch):
+    monkeypatch.setattr(persistence, '_has_pyarrow', lambda: False)
+    data = _data()
+    save_data_arrays(data, tmp_path / "data")
+    
+    assert not list((tmp_path / "data").glob("*.feather"))
+    loaded = intern_names(load_data_arrays(tmp_path / "data"))
+    assert loaded['gene_names'] == data['gene_names']
+    assert loaded['sample_names'] == data['sample_names']
+
+
+def test_meta_json(tmp_path):
+    save_data_arrays(_data(), tmp_path / "data")
+    
+    with open(tmp_path / "data" / "meta.json") as f:
+        meta = json.load(f)
+    assert meta['arrays'] == ['expression_features']
+    assert meta['data']['preprocessing_params'] == {'n_features': 4, 'nan_strategy': 'zero'}
+    
+    loaded = load_data_arrays(tmp_path / "data")
+    assert loaded['preprocessing_params'] == {'n_features': 4, 'nan_strategy': 'zero'}
+
+
+def test_resave_over_loaded_memmaps(tmp_path):
+    data = _data()
+    save_data_arrays(data, tmp_path / "data")
+    loaded = load_data_arrays(tmp_path / "data", mmap_mode='r')
+    
+    save_data_arrays(loaded, tmp_path / "data")
+    
+    np.testing.assert_array_equal(loaded['expression_features'], data['expression_features'])
+    reloaded = load_data_arrays(tmp_path / "data")
+    np.testing.assert_array_equal(reloaded['expression_features'], data['expression_features'])
+    assert [p.name for p in tmp_path.iterdir()] == ["data"]
+
+
+def test_failed_save_leaves_no_complete_directory(tmp_path):
+    save_data_arrays(_data(), tmp_path / "data")
+    
+    with pytest.raises(TypeError):
+        save_data_arrays({**_data(), 'bad': object()}, tmp_path / "data")
+    
+    assert [p.name for p in tmp_path.iterdir()] == ["data"]
+    assert load_data_arrays(tmp_path / "data")['preprocessing_params']['n_features'] == 4
+
+
+def test_nested_values_round_trip(tmp_path):
+    data = {
+        **_data(),
+        'preprocessing_params': {
+            'n_features': np.int64(4),
+            'threshold': np.float32(0.5),
+            'shape': (3, 4),
+            'scaler': {'mean': np.array([1.0, 2.0]), 'scale': [np.ones(2, dtype=np.float32)]},
+        },
+    }
+    save_data_arrays(data, tmp_path / "data")
+    
+    params = load_data_arrays(tmp_path / "data")['preprocessing_params']
+    assert params['n_features'] == 4 and type(params['n_features']) is np.int64
+    assert type(params['threshold']) is np.float32
+    assert params['shape'] == (3, 4)
+    np.testing.assert_array_equal(params['scaler']['mean'], [1.0, 2.0])
+    assert params['scaler']['scale'][0].dtype == np.float32
+
+
+@pytest.mark.parametrize('value', [
+    {1: 'a'},
+    np.array(['a', None], dtype=object),
+    object(),
+])
+def test_unstorable_values_are_rejected(tmp_path, value):
+    with pytest.raises(TypeError):
+        save_data_arrays({'preprocessing_params': {'bad': value}}, tmp_path / "data")
+    assert not (tmp_path / "data").exists()
+
+
+def test_only_name_keys_use_feather(tmp_path):
+    pytest.importorskip('pyarrow')
+    data = {**_data(), 'cell_types': ['T', 'B'], 'gene_names': ['Gene_000', 'Gene_001']}
+    save_data_arrays(data, tmp_path / "data")
+    
+    assert sorted(p.name for p in (tmp_path / "data").glob("*.feather")) == [
+        "gene_names.feather", "sample_names.feather"]
+    loaded = load_data_arrays(tmp_path / "data")
+    assert loaded['cell_types'] == ['T', 'B']
+    assert loaded['gene_names'] == ('Gene_000', 'Gene_001')
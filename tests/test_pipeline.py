@@ -0,0 +1,403 @@
+import importlib
+import logging
+import sys
+import threading
+import types
+from concurrent.futures import wait
+
+import numpy as np
+import pytest
+
+import rna_seq_factornet.data.loader as loader_module
+from rna_seq_factornet.interpretation.methods import InterpretationMethods
+
+# pipeline.core imports the model wrapper and data loader, which are not part
+# of this tree; stand in for them so the pipeline logic itself can be tested
+if importlib.util.find_spec('rna_seq_factornet.models') is None:
+    sys.modules['rna_seq_factornet.models'] = types.ModuleType('rna_seq_factornet.models')
+    factornet = types.ModuleType('rna_seq_factornet.models.factornet')
+    factornet.ExpressionFactorNet = None
+    sys.modules['rna_seq_factornet.models.factornet'] = factornet
+if not hasattr(loader_module, 'ExpressionDataLoader'):
+    loader_module.ExpressionDataLoader = None
+
+from rna_seq_factornet.pipeline import core
+from rna_seq_factornet.pipeline.core import ExpressionPipeline
+
+N_GENES, N_SAMPLES = 6, 4
+
+
+class FakeLoader:
+    calls = 0
+
+    def __init__(self, cache_dir):
+        pass
+
+    def load_expression_data(self, filepath, nan_strategy, **kwargs):
+        FakeLoader.calls += 1
+        return None
+
+    def preprocess_for_factornet(self, raw_data, min_expression, feature_selection):
+        features = np.arange(N_GENES * N_SAMPLES, dtype=np.float32).reshape(N_GENES, N_SAMPLES)
+        return {
+            'expression_features': features,
+            'expression_targets': features.sum(axis=1),
+            'gene_names': [f"Gene_{i:03d}" for i in range(N_GENES)],
+            'sample_names': [f"Sample_{i:02d}" for i in range(N_SAMPLES)],
+            'preprocessing_params': {
+                'n_features': N_SAMPLES,
+                'shape': (N_GENES, N_SAMPLES),
+                'scale': np.float32(1.5),
+                'means': features.mean(axis=0),
+            },
+        }
+
+
+class FakeModel:
+    instances = []
+
+    def __init__(self, n_features, **params):
+        tf = sys.modules.get('tensorflow')
+        self.policy = tf.keras.mixed_precision.global_policy() if tf else None
+        self.n_jobs = None
+        FakeModel.instances.append(self)
+
+    def train(self, X, y, epochs, batch_size):
+        return {}
+
+    def train_with_cv(self, X, y, k_folds, epochs, batch_size, n_jobs):
+        self.n_jobs = n_jobs
+        return {'mean_r2': 0.5, 'std_r2': 0.1}
+
+    def load_model(self, filepath):
+        pass
+
+
+class FakeInterpreter(InterpretationMethods):
+    """Gradient 2 * x per target t scaled by (t + 1); records the calling threads"""
+
+    def __init__(self, model):
+        super().__init__(model)
+        self.calls = []
+
+    def standard_gradients(self, features, batch_size=128, target_indices=None):
+        self.calls.append(('gradients', threading.current_thread()))
+        if target_indices is None:
+            return 2 * features, features.sum(axis=1)
+        grads = np.stack([2 * (t + 1) * features for t in target_indices], axis=1)
+        return grads, np.stack([features.sum(axis=1)] * len(target_indices), axis=1)
+
+    def integrated_gradients_scores(self, features, steps=50, schedule='uniform',
+                                    batch_size=128, reduce_on_device=True, target_indices=None):
+        self.calls.append(('ig', threading.current_thread()))
+        self.ig_options = dict(steps=steps, schedule=schedule, batch_size=batch_size,
+                               reduce_on_device=reduce_on_device)
+        return features / 2, features.sum(axis=1)
+
+
+def fake_tensorflow(gpus=()):
+    tf = types.ModuleType('tensorflow')
+    policy = ['float32']
+    tf.config = types.SimpleNamespace(list_physical_devices=lambda kind: list(gpus))
+    tf.keras = types.SimpleNamespace(mixed_precision=types.SimpleNamespace(
+        global_policy=lambda: policy[0],
+        set_global_policy=lambda name: policy.__setitem__(0, name)))
+    return tf
+
+
+@pytest.fixture(autouse=True)
+def stubs(monkeypatch):
+    monkeypatch.setattr(core, 'ExpressionDataLoader', FakeLoader)
+    monkeypatch.setattr(core, 'ExpressionFactorNet', FakeModel)
+    monkeypatch.setattr(core, 'InterpretationMethods', FakeInterpreter)
+    monkeypatch.setattr(FakeLoader, 'calls', 0)
+    monkeypatch.setattr(FakeModel, 'instances', [])
+    monkeypatch.delitem(sys.modules, 'tensorflow', raising=False)
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "expression.csv"
+    path.write_text("placeholder")
+    return str(path)
+
+
+@pytest.fixture
+def pipeline(tmp_path, data_file):
+    pipeline = ExpressionPipeline(cache_dir=str(tmp_path / "cache"), verbose=False)
+    pipeline.load_data(data_file)
+    pipeline.train_model(use_cv=False)
+    return pipeline
+
+
+# Data cache
+
+def test_cache_hit_matches_miss(tmp_path, data_file):
+    miss = ExpressionPipeline(cache_dir=str(tmp_path / "cache"), verbose=False).load_data(data_file)
+    hit = ExpressionPipeline(cache_dir=str(tmp_path / "cache"), verbose=False).load_data(data_file)
+
+    assert FakeLoader.calls == 1
+    assert miss.keys() == hit.keys()
+    assert hit['gene_names'] == miss['gene_names'] == tuple(f"Gene_{i:03d}" for i in range(N_GENES))
+    for params in (miss['preprocessing_params'], hit['preprocessing_params']):
+        assert params['shape'] == (N_GENES, N_SAMPLES)
+        assert type(params['scale']) is np.float32
+    np.testing.assert_array_equal(hit['expression_features'], miss['expression_features'])
+    np.testing.assert_array_equal(hit['preprocessing_params']['means'],
+                                  miss['preprocessing_params']['means'])
+
+
+def test_cached_arrays_are_copy_on_write(tmp_path, data_file):
+    for _ in range(2):
+        data = ExpressionPipeline(cache_dir=str(tmp_path / "cache"), verbose=False).load_data(data_file)
+        assert data['expression_features'][0, 1] == 1.0
+        data['expression_features'] /= 2
+        assert data['expression_features'][0, 1] == 0.5
+
+
+def test_cache_key_includes_version(tmp_path, data_file, monkeypatch):
+    ExpressionPipeline(cache_dir=str(tmp_path / "cache"), verbose=False).load_data(data_file)
+    monkeypatch.setattr(core, '__version__', '99.0')
+    ExpressionPipeline(cache_dir=str(tmp_path / "cache"), verbose=False).load_data(data_file)
+    assert FakeLoader.calls == 2
+
+
+def test_unwritable_cache_is_skipped(tmp_path, data_file, monkeypatch, caplog):
+    def fail(data, directory):
+        raise OSError("read-only file system")
+
+    monkeypatch.setattr(core, 'save_data_arrays', fail)
+    data = ExpressionPipeline(cache_dir=str(tmp_path / "cache"), verbose=False).load_data(data_file)
+
+    assert data['expression_features'].shape == (N_GENES, N_SAMPLES)
+    assert "read-only file system" in caplog.text
+
+
+def test_load_data_without_cache_always_reloads(tmp_path, data_file):
+    pipeline = ExpressionPipeline(cache_dir=str(tmp_path / "cache"), verbose=False)
+    pipeline.load_data(data_file, use_cache=False)
+    pipeline.load_data(data_file, use_cache=False)
+    assert FakeLoader.calls == 2
+    assert not list((tmp_path / "cache").iterdir())
+
+
+def test_legacy_pipeline_needs_legacy_flag(tmp_path):
+    (tmp_path / "saved_data.pkl").write_bytes(b"")
+    pipeline = ExpressionPipeline(cache_dir=str(tmp_path / "cache"), verbose=False)
+    with pytest.raises(ValueError, match="legacy=True"):
+        pipeline.load_pipeline(str(tmp_path / "saved"))
+
+
+# Training
+
+@pytest.mark.parametrize('gpus, n_jobs, expected', [
+    ((), None, 5),
+    (('GPU:0',), None, 1),
+    ((), 3, 3),
+])
+def test_cv_n_jobs(tmp_path, data_file, monkeypatch, gpus, n_jobs, expected):
+    monkeypatch.setitem(sys.modules, 'tensorflow', fake_tensorflow(gpus))
+    pipeline = ExpressionPipeline(cache_dir=str(tmp_path / "cache"), verbose=False)
+    pipeline.load_data(data_file)
+    pipeline.train_model(use_cv=True, k_folds=5, n_jobs=n_jobs)
+    assert pipeline.model.n_jobs == expected
+
+
+def test_mixed_precision_is_restored_and_trains_folds_serially(tmp_path, data_file, monkeypatch):
+    tf = fake_tensorflow()
+    monkeypatch.setitem(sys.modules, 'tensorflow', tf)
+    pipeline = ExpressionPipeline(cache_dir=str(tmp_path / "cache"), precision='fp16', verbose=False)
+    pipeline.load_data(data_file)
+    pipeline.train_model(use_cv=True, k_folds=5, n_jobs=4)
+
+    assert pipeline.model.policy == 'mixed_float16'
+    assert pipeline.model.n_jobs == 1
+    assert tf.keras.mixed_precision.global_policy() == 'float32'
+
+    # A later fp32 pipeline is not affected by the fp16 one
+    ExpressionPipeline(cache_dir=str(tmp_path / "cache"), verbose=False).load_data(data_file)
+    fp32 = ExpressionPipeline(cache_dir=str(tmp_path / "cache"), verbose=False)
+    fp32.load_data(data_file)
+    fp32.train_model(use_cv=False)
+    assert fp32.model.policy == 'float32'
+
+
+# Interpretation
+
+def test_interpret_gradient_methods(pipeline):
+    features = np.asarray(pipeline.data['expression_features'])[:3]
+    expected = {'gradients': 2 * features, 'saliency': np.abs(2 * features),
+                'bpnet': 2 * features * features}
+    for method, importance in expected.items():
+        results = pipeline.interpret(method, n_genes=3)
+        np.testing.assert_array_equal(results['feature_importance'], importance)
+        np.testing.assert_array_equal(results['predictions'], features.sum(axis=1))
+        assert results['gene_names'] == pipeline.data['gene_names'][:3]
+
+
+def test_interpret_passes_ig_options(pipeline):
+    pipeline.interpret('integrated_gradients', n_genes=2, batch_size=16, steps=10,
+                       schedule='gauss', ig_batch_size=7, reduce_on_device=False)
+    assert pipeline.interpreter.ig_options == dict(steps=10, schedule='gauss', batch_size=7,
+                                                   reduce_on_device=False)
+
+    pipeline.interpret('integrated_gradients', n_genes=2, batch_size=16)
+    assert pipeline.interpreter.ig_options == dict(steps=50, schedule='uniform', batch_size=16,
+                                                   reduce_on_device=True)
+
+
+@pytest.mark.parametrize('method', ['saliency', 'integrated_gradients'])
+def test_unknown_options_are_rejected(pipeline, method):
+    with pytest.raises(ValueError, match="step"):
+        pipeline.interpret(method, n_genes=2, step=100)
+
+
+def test_unknown_method_is_rejected(pipeline):
+    with pytest.raises(ValueError, match="Unknown interpretation method"):
+        pipeline.interpret('deeplift')
+
+
+def test_interpreter_must_return_pair(pipeline, monkeypatch):
+    monkeypatch.setattr(pipeline.interpreter, 'standard_gradients',
+                        lambda features, batch_size, target_indices: 2 * features)
+    with pytest.raises(TypeError, match=r"\(importance, y_hat\)"):
+        pipeline.interpret('saliency', n_genes=2)
+
+
+def test_iter_interpret_streams_one_gene_at_a_time(pipeline):
+    full = pipeline.interpret('bpnet', n_genes=4)['feature_importance']
+    stream = list(pipeline.iter_interpret('bpnet', n_genes=4))
+
+    assert [idx for idx, _ in stream] == [0, 1, 2, 3]
+    for idx, importance in stream:
+        np.testing.assert_array_equal(importance, full[idx])
+    assert len(pipeline.interpreter.calls) == 1 + 4
+
+
+# compare_methods
+
+def test_compare_methods_shares_one_gradient_pass(pipeline):
+    results = pipeline.compare_methods(['integrated_gradients', 'saliency', 'bpnet'], n_genes=3)
+
+    assert list(results) == ['integrated_gradients', 'saliency', 'bpnet']
+    assert sorted(name for name, _ in pipeline.interpreter.calls) == ['gradients', 'ig']
+    for method in ('saliency', 'bpnet'):
+        np.testing.assert_array_equal(results[method]['feature_importance'],
+                                      pipeline.interpret(method, n_genes=3)['feature_importance'])
+    gene_names = results['bpnet']['gene_names']
+    assert all(result['gene_names'] is gene_names for result in results.values())
+
+
+def test_compare_methods_runs_tasks_in_a_pool(pipeline):
+    pipeline.compare_methods(['bpnet', 'saliency', 'integrated_gradients'], n_genes=3)
+    assert all(thread is not threading.main_thread() for _, thread in pipeline.interpreter.calls)
+
+
+def test_compare_methods_single_task_skips_the_pool(pipeline, monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("thread pool used for a single task")
+
+    monkeypatch.setattr(core, 'ThreadPoolExecutor', no_pool)
+    results = pipeline.compare_methods(['saliency', 'bpnet'], n_genes=2)
+    assert list(results) == ['saliency', 'bpnet']
+    assert pipeline.compare_methods([], n_genes=2) == {}
+
+
+def test_compare_methods_with_targets(pipeline):
+    features = np.asarray(pipeline.data['expression_features'])[:2]
+    results = pipeline.compare_methods(['gradients', 'bpnet'], n_genes=2, targets=[0, 1])
+
+    grads = results['gradients']['feature_importance']
+    assert grads.shape == (2, 2, N_SAMPLES)
+    np.testing.assert_array_equal(grads[:, 1], 4 * features)
+    np.testing.assert_array_equal(results['bpnet']['feature_importance'], grads * features[:, None])
+    np.testing.assert_array_equal(results['bpnet']['feature_importance'],
+                                  pipeline.interpret('bpnet', n_genes=2, targets=[0, 1])['feature_importance'])
+
+
+# Visualization
+
+class FakeVisualizer:
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    def _figure(self, *args):
+        import matplotlib.pyplot as plt
+        fig, _ = plt.subplots()
+        if self.fail:
+            def savefig(*args, **kwargs):
+                raise OSError(f"disk full ({args[0]})")
+            fig.savefig = savefig
+        return fig
+
+    plot_contribution_profile = plot_contribution_heatmap = _figure
+
+
+@pytest.fixture
+def plt():
+    pytest.importorskip('matplotlib')
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    plt.close('all')
+    return plt
+
+
+def test_visualize_writes_and_closes_figures(pipeline, plt, tmp_path):
+    pipeline.visualizer = FakeVisualizer()
+    results = pipeline.interpret('saliency', n_genes=2)
+
+    pipeline.visualize(results)
+    assert plt.get_fignums() == []
+
+    pipeline.visualize(results, save_dir=str(tmp_path / "plots"))
+    pipeline.join()
+    assert sorted(p.name for p in (tmp_path / "plots").iterdir()) == [
+        "Gene_000_saliency.png", "heatmap_saliency.png"]
+    assert plt.get_fignums() == []
+
+
+def test_visualize_stream(pipeline, plt, tmp_path):
+    pipeline.visualizer = FakeVisualizer()
+    pipeline.visualize(pipeline.iter_interpret('bpnet', n_genes=3), method='bpnet',
+                       save_dir=str(tmp_path))
+    pipeline.join()
+    assert sorted(p.name for p in tmp_path.glob("*.png")) == [
+        f"Gene_{i:03d}_bpnet.png" for i in range(3)]
+
+    with pytest.raises(ValueError, match="method is required"):
+        pipeline.visualize(pipeline.iter_interpret('bpnet', n_genes=1))
+
+
+def test_join_raises_and_logs_every_failure(pipeline, plt, tmp_path, caplog):
+    pipeline.visualizer = FakeVisualizer(fail=True)
+    pipeline.visualize(pipeline.interpret('saliency', n_genes=2), save_dir=str(tmp_path))
+
+    with pytest.raises(OSError, match="disk full"):
+        pipeline.join()
+    assert caplog.text.count("Figure write failed") == 1
+    pipeline.join()
+
+
+def test_visualize_raises_pending_failures(pipeline, plt, tmp_path):
+    pipeline.visualizer = FakeVisualizer(fail=True)
+    results = pipeline.interpret('saliency', n_genes=2)
+    pipeline.visualize(results, save_dir=str(tmp_path))
+    wait(pipeline._io_futures)
+
+    pipeline.visualizer = FakeVisualizer()
+    with pytest.raises(OSError, match="disk full"):
+        pipeline.visualize(results, save_dir=str(tmp_path))
+    pipeline.visualize(results, save_dir=str(tmp_path))
+    pipeline.join()
+
+
+# Logging
+
+def test_verbosity_is_per_pipeline(tmp_path, caplog):
+    caplog.set_level(logging.INFO)
+    ExpressionPipeline(cache_dir=str(tmp_path / "cache"), verbose=False)
+    assert "initialized" not in caplog.text
+    ExpressionPipeline(cache_dir=str(tmp_path / "cache"), verbose=True)
+    ExpressionPipeline(cache_dir=str(tmp_path / "cache"), verbose=False)
+    assert caplog.text.count("initialized") == 1